@@ -1,8 +1,10 @@
 """Support for Tuya Smart devices."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
+from dataclasses import dataclass
 import logging
-from typing import NamedTuple
 
 from tuya_iot import (
     AuthType,
@@ -17,7 +19,8 @@ from tuya_iot import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry
-from homeassistant.helpers.dispatcher import dispatcher_send
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send, dispatcher_send
 
 from .const import (
     CONF_ACCESS_ID,
@@ -31,16 +34,22 @@ from .const import (
     CONF_USERNAME,
     DOMAIN,
     PLATFORMS,
+    TUYA_DISCOVERY_BATCH_DELAY,
+    TUYA_DISCOVERY_BATCH_MAX_DELAY,
     TUYA_DISCOVERY_NEW,
     TUYA_HA_SIGNAL_UPDATE_ENTITY,
+    TUYA_MQ_RESTART_COOLDOWN,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class HomeAssistantTuyaData(NamedTuple):
+@dataclass(frozen=True)
+class HomeAssistantTuyaData:
     """Tuya data stored in the Home Assistant data object."""
 
+    __slots__ = ("device_listener", "device_manager", "home_manager")
+
     device_listener: TuyaDeviceListener
     device_manager: TuyaDeviceManager
     home_manager: TuyaHomeManager
@@ -48,24 +57,24 @@ class HomeAssistantTuyaData(NamedTuple):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Async setup hass config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    return await _init_tuya_sdk(hass, entry)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate old entry."""
+    _LOGGER.debug("Migrating from version %s", entry.version)
 
     # Project type has been renamed to auth type in the upstream Tuya IoT SDK.
     # This migrates existing config entries to reflect that name change.
-    if CONF_PROJECT_TYPE in entry.data:
-        data = {**entry.data, CONF_AUTH_TYPE: entry.data[CONF_PROJECT_TYPE]}
-        data.pop(CONF_PROJECT_TYPE)
+    if entry.version == 1:
+        data = {**entry.data}
+        if CONF_PROJECT_TYPE in data:
+            data[CONF_AUTH_TYPE] = data.pop(CONF_PROJECT_TYPE)
+        entry.version = 2
         hass.config_entries.async_update_entry(entry, data=data)
 
-    success = await _init_tuya_sdk(hass, entry)
-
-    if not success:
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-        if not hass.data[DOMAIN]:
-            hass.data.pop(DOMAIN)
-
-    return bool(success)
+    _LOGGER.debug("Migration to version %s successful", entry.version)
+    return True
 
 
 async def _init_tuya_sdk(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -99,13 +108,12 @@ async def _init_tuya_sdk(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     tuya_mq = TuyaOpenMQ(api)
     tuya_mq.start()
 
-    device_ids: set[str] = set()
     device_manager = TuyaDeviceManager(api, tuya_mq)
     home_manager = TuyaHomeManager(api, tuya_mq, device_manager)
-    listener = DeviceListener(hass, device_manager, device_ids)
+    listener = DeviceListener(hass, device_manager)
     device_manager.add_device_listener(listener)
 
-    hass.data[DOMAIN][entry.entry_id] = HomeAssistantTuyaData(
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = HomeAssistantTuyaData(
         device_listener=listener,
         device_manager=device_manager,
         home_manager=home_manager,
@@ -113,38 +121,44 @@ async def _init_tuya_sdk(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Get devices & clean up device entities
     await hass.async_add_executor_job(home_manager.update_device_cache)
-    await cleanup_device_registry(hass, device_manager)
-
-    # Register known device IDs
-    for device in device_manager.device_map.values():
-        device_ids.add(device.id)
+    cleanup_device_registry(hass, device_manager)
 
     hass.config_entries.async_setup_platforms(entry, PLATFORMS)
     return True
 
 
-async def cleanup_device_registry(
+@callback
+def cleanup_device_registry(
     hass: HomeAssistant, device_manager: TuyaDeviceManager
 ) -> None:
     """Remove deleted device registry entry if there are no remaining entities."""
     device_registry_object = device_registry.async_get(hass)
-    for dev_id, device_entry in list(device_registry_object.devices.items()):
-        for item in device_entry.identifiers:
-            if DOMAIN == item[0] and item[1] not in device_manager.device_map:
-                device_registry_object.async_remove_device(dev_id)
-                break
+    known_device_ids = device_manager.device_map.keys()
+    stale_device_ids: list[str] = []
+    for device_entry in device_registry.async_entries_for_identifier_domain(
+        device_registry_object, DOMAIN
+    ):
+        tuya_device_ids = {
+            item[1] for item in device_entry.identifiers if item[0] == DOMAIN
+        }
+        if not tuya_device_ids <= known_device_ids:
+            stale_device_ids.append(device_entry.id)
+
+    for device_id in stale_device_ids:
+        device_registry_object.async_remove_device(device_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unloading the Tuya platforms."""
     unload = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload:
-        hass_data: HomeAssistantTuyaData = hass.data[DOMAIN][entry.entry_id]
+        domain_data = hass.data[DOMAIN]
+        hass_data: HomeAssistantTuyaData = domain_data.pop(entry.entry_id)
+        await hass_data.device_listener.async_stop()
         hass_data.device_manager.mq.stop()
         hass_data.device_manager.remove_device_listener(hass_data.device_listener)
 
-        hass.data[DOMAIN].pop(entry.entry_id)
-        if not hass.data[DOMAIN]:
+        if not domain_data:
             hass.data.pop(DOMAIN)
 
     return unload
@@ -157,30 +171,64 @@ class DeviceListener(TuyaDeviceListener):
         self,
         hass: HomeAssistant,
         device_manager: TuyaDeviceManager,
-        device_ids: set[str],
     ) -> None:
         """Init DeviceListener."""
         self.hass = hass
         self.device_manager = device_manager
-        self.device_ids = device_ids
+        self._device_registry = device_registry.async_get(hass)
+        self._update_signals: dict[str, str] = {}
+        self._discovery_ids: list[str] = []
+        self._discovery_handle: asyncio.TimerHandle | None = None
+        self._discovery_deadline = 0.0
+        self._stopped = False
+        self._mq_restart: Awaitable[None] | None = None
+        self._mq_restart_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=TUYA_MQ_RESTART_COOLDOWN,
+            immediate=False,
+            function=self._async_restart_mq,
+        )
 
     def update_device(self, device: TuyaDevice) -> None:
         """Update device status."""
-        if device.id in self.device_ids:
-            _LOGGER.debug(
-                "Received update for device %s: %s",
-                device.id,
-                self.device_manager.device_map[device.id].status,
-            )
-            dispatcher_send(self.hass, f"{TUYA_HA_SIGNAL_UPDATE_ENTITY}_{device.id}")
+        if device.id in self.device_manager.device_map:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Received update for device %s: %s",
+                    device.id,
+                    self.device_manager.device_map[device.id].status,
+                )
+            signal = self._update_signals.get(device.id)
+            if signal is None:
+                signal = f"{TUYA_HA_SIGNAL_UPDATE_ENTITY}_{device.id}"
+                self._update_signals[device.id] = signal
+            dispatcher_send(self.hass, signal)
 
     def add_device(self, device: TuyaDevice) -> None:
         """Add device added listener."""
         # Ensure the device isn't present stale
-        self.hass.add_job(self.async_remove_device, device.id)
+        self.hass.loop.call_soon_threadsafe(self.async_remove_device, device.id)
+        self.hass.loop.call_soon_threadsafe(self._async_queue_discovery, device.id)
+
+        # The MQ only picks up new devices after reconnecting, restart it
+        # once per burst of added devices instead of once per device.
+        self.hass.add_job(self._mq_restart_debouncer.async_call)
 
-        self.device_ids.add(device.id)
-        dispatcher_send(self.hass, TUYA_DISCOVERY_NEW, [device.id])
+    async def _async_restart_mq(self) -> None:
+        """Restart the MQ so it receives messages for newly added devices."""
+        self._mq_restart = mq_restart = self.hass.async_add_executor_job(
+            self._restart_mq
+        )
+        try:
+            await mq_restart
+        finally:
+            self._mq_restart = None
+
+    def _restart_mq(self) -> None:
+        """Replace the running MQ with a freshly connected one."""
+        if self._stopped:
+            return
 
         device_manager = self.device_manager
         device_manager.mq.stop()
@@ -190,18 +238,63 @@ class DeviceListener(TuyaDeviceListener):
         device_manager.mq = tuya_mq
         tuya_mq.add_message_listener(device_manager.on_message)
 
+    @callback
+    def _async_queue_discovery(self, device_id: str) -> None:
+        """Queue a newly added device to be announced to the platforms."""
+        if device_id not in self._discovery_ids:
+            self._discovery_ids.append(device_id)
+        # The SDK waits a second before announcing each bound device, so keep
+        # extending the window while a burst of devices is still coming in,
+        # but never hold back the first device longer than the max delay.
+        now = self.hass.loop.time()
+        if self._discovery_handle is None:
+            self._discovery_deadline = now + TUYA_DISCOVERY_BATCH_MAX_DELAY
+        else:
+            self._discovery_handle.cancel()
+        self._discovery_handle = self.hass.loop.call_at(
+            min(now + TUYA_DISCOVERY_BATCH_DELAY, self._discovery_deadline),
+            self._async_flush_discovery,
+        )
+
+    @callback
+    def _async_flush_discovery(self) -> None:
+        """Announce all queued devices to the platforms in a single signal."""
+        self._discovery_handle = None
+        device_map = self.device_manager.device_map
+        # Devices may have been deleted again while waiting
+        device_ids = [
+            device_id for device_id in self._discovery_ids if device_id in device_map
+        ]
+        self._discovery_ids = []
+        if device_ids:
+            async_dispatcher_send(self.hass, TUYA_DISCOVERY_NEW, device_ids)
+
+    async def async_stop(self) -> None:
+        """Cancel pending device announcements and MQ restarts.
+
+        Waits for an MQ restart that is already running, so the caller can
+        safely stop the MQ that is current afterwards.
+        """
+        self._stopped = True
+        self._mq_restart_debouncer.async_cancel()
+        if self._discovery_handle is not None:
+            self._discovery_handle.cancel()
+            self._discovery_handle = None
+        self._discovery_ids = []
+        if self._mq_restart is not None:
+            await self._mq_restart
+
     def remove_device(self, device_id: str) -> None:
         """Add device removed listener."""
-        self.hass.add_job(self.async_remove_device, device_id)
+        self.hass.loop.call_soon_threadsafe(self.async_remove_device, device_id)
 
     @callback
     def async_remove_device(self, device_id: str) -> None:
         """Remove device from Home Assistant."""
         _LOGGER.debug("Remove device: %s", device_id)
-        device_registry_object = device_registry.async_get(self.hass)
-        device_entry = device_registry_object.async_get_device(
+        self._update_signals.pop(device_id, None)
+        device_entry = self._device_registry.async_get_device(
             identifiers={(DOMAIN, device_id)}
         )
         if device_entry is not None:
-            device_registry_object.async_remove_device(device_entry.id)
-            self.device_ids.discard(device_id)
+            self._device_registry.async_remove_device(device_entry.id)
@@ -35,6 +35,8 @@ _LOGGER = logging.getLogger(__name__)
 class TuyaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Tuya Config Flow."""
 
+    VERSION = 2
+
     @staticmethod
     def _try_login(user_input: dict[str, Any]) -> tuple[dict[Any, Any], dict[str, Any]]:
         """Try login."""
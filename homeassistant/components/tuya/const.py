@@ -76,7 +76,10 @@ CONF_COUNTRY_CODE = "country_code"
 CONF_APP_TYPE = "tuya_app_type"
 
 TUYA_DISCOVERY_NEW = "tuya_discovery_new"
+TUYA_DISCOVERY_BATCH_DELAY = 2
+TUYA_DISCOVERY_BATCH_MAX_DELAY = 5
 TUYA_HA_SIGNAL_UPDATE_ENTITY = "tuya_entry_update"
+TUYA_MQ_RESTART_COOLDOWN = 5
 
 TUYA_RESPONSE_CODE = "code"
 TUYA_RESPONSE_RESULT = "result"
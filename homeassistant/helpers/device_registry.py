@@ -1,7 +1,7 @@
 """Provide a way to connect entities belonging to one device."""
 from __future__ import annotations
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 import logging
 import time
 from typing import TYPE_CHECKING, Any, NamedTuple, cast
@@ -47,6 +47,8 @@ ORPHANED_DEVICE_KEEP_SECONDS = 86400 * 30
 class _DeviceIndex(NamedTuple):
     identifiers: dict[tuple[str, str], str]
     connections: dict[tuple[str, str], str]
+    # Only kept for registered devices, nothing looks up deleted devices by domain
+    identifier_domains: defaultdict[str, set[str]] | None
 
 
 @attr.s(slots=True, frozen=True)
@@ -229,8 +231,12 @@ class DeviceRegistry:
 
     def _clear_index(self) -> None:
         """Clear the index."""
-        self._registered_index = _DeviceIndex(identifiers={}, connections={})
-        self._deleted_index = _DeviceIndex(identifiers={}, connections={})
+        self._registered_index = _DeviceIndex(
+            identifiers={}, connections={}, identifier_domains=defaultdict(set)
+        )
+        self._deleted_index = _DeviceIndex(
+            identifiers={}, connections={}, identifier_domains=None
+        )
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
@@ -672,6 +678,19 @@ def async_entries_for_config_entry(
     ]
 
 
+@callback
+def async_entries_for_identifier_domain(
+    registry: DeviceRegistry, domain: str
+) -> list[DeviceEntry]:
+    """Return entries that have an identifier belonging to a domain."""
+    devices_index = registry._registered_index  # pylint: disable=protected-access
+    assert devices_index.identifier_domains is not None
+    return [
+        registry.devices[device_id]
+        for device_id in devices_index.identifier_domains.get(domain, ())
+    ]
+
+
 @callback
 def async_config_entry_disabled_by_changed(
     registry: DeviceRegistry, config_entry: ConfigEntry
@@ -811,8 +830,11 @@ def _add_device_to_index(
     device: DeviceEntry | DeletedDeviceEntry,
 ) -> None:
     """Add a device to the index."""
+    identifier_domains = devices_index.identifier_domains
     for identifier in device.identifiers:
         devices_index.identifiers[identifier] = device.id
+        if identifier_domains is not None:
+            identifier_domains[identifier[0]].add(device.id)
     for connection in device.connections:
         devices_index.connections[connection] = device.id
 
@@ -822,9 +844,17 @@ def _remove_device_from_index(
     device: DeviceEntry | DeletedDeviceEntry,
 ) -> None:
     """Remove a device from the index."""
+    identifier_domains = devices_index.identifier_domains
     for identifier in device.identifiers:
         if identifier in devices_index.identifiers:
             del devices_index.identifiers[identifier]
+        if identifier_domains is None:
+            continue
+        domain_devices = identifier_domains.get(identifier[0])
+        if domain_devices is not None:
+            domain_devices.discard(device.id)
+            if not domain_devices:
+                del identifier_domains[identifier[0]]
     for connection in device.connections:
         if connection in devices_index.connections:
             del devices_index.connections[connection]
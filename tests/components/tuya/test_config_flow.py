@@ -96,6 +96,8 @@ async def test_user_flow(
     country = [country for country in TUYA_COUNTRIES if country.name == MOCK_COUNTRY][0]
 
     assert result["type"] == data_entry_flow.RESULT_TYPE_CREATE_ENTRY
+    assert result["version"] == 2
+    assert result["result"].version == 2
     assert result["title"] == MOCK_USERNAME
     assert result["data"][CONF_ACCESS_ID] == MOCK_ACCESS_ID
     assert result["data"][CONF_ACCESS_SECRET] == MOCK_ACCESS_SECRET
@@ -0,0 +1,53 @@
+"""Tests for the Tuya integration."""
+from homeassistant.components.tuya import async_migrate_entry
+from homeassistant.components.tuya.config_flow import TuyaConfigFlow
+from homeassistant.components.tuya.const import (
+    CONF_ACCESS_ID,
+    CONF_AUTH_TYPE,
+    CONF_PROJECT_TYPE,
+    DOMAIN,
+)
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockConfigEntry
+
+
+async def test_migrate_project_type(hass: HomeAssistant) -> None:
+    """Test project type is migrated to auth type."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ACCESS_ID: "myAccessId", CONF_PROJECT_TYPE: 1},
+    )
+    entry.add_to_hass(hass)
+    assert entry.version == 1
+
+    assert await async_migrate_entry(hass, entry)
+
+    assert entry.version == TuyaConfigFlow.VERSION == 2
+    assert entry.data == {CONF_ACCESS_ID: "myAccessId", CONF_AUTH_TYPE: 1}
+
+
+async def test_migrate_without_project_type(hass: HomeAssistant) -> None:
+    """Test entries already using auth type only get their version bumped."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ACCESS_ID: "myAccessId", CONF_AUTH_TYPE: 0},
+    )
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry)
+
+    assert entry.version == 2
+    assert entry.data == {CONF_ACCESS_ID: "myAccessId", CONF_AUTH_TYPE: 0}
+
+
+async def test_migrate_current_version(hass: HomeAssistant) -> None:
+    """Test entries already at the current version are left untouched."""
+    data = {CONF_ACCESS_ID: "myAccessId", CONF_PROJECT_TYPE: 1}
+    entry = MockConfigEntry(domain=DOMAIN, version=2, data=data)
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry)
+
+    assert entry.version == 2
+    assert entry.data == data
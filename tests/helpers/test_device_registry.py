@@ -370,6 +370,36 @@ async def test_deleted_device_removing_config_entries(hass, registry, update_eve
     assert entry3.id != entry4.id
 
 
+async def test_entries_for_identifier_domain(registry):
+    """Test looking up devices by identifier domain."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "0123"), ("other", "abc")},
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "4567")},
+    )
+    registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("other", "def")},
+    )
+
+    entries = device_registry.async_entries_for_identifier_domain(registry, "bridgeid")
+    assert {device.id for device in entries} == {entry.id, entry2.id}
+    assert device_registry.async_entries_for_identifier_domain(registry, "none") == []
+
+    registry.async_remove_device(entry.id)
+    assert device_registry.async_entries_for_identifier_domain(
+        registry, "bridgeid"
+    ) == [registry.async_get(entry2.id)]
+
+    registry.async_update_device(entry2.id, new_identifiers={("other", "ghi")})
+    assert (
+        device_registry.async_entries_for_identifier_domain(registry, "bridgeid") == []
+    )
+
+
 async def test_removing_area_id(registry):
     """Make sure we can clear area id."""
     entry = registry.async_get_or_create(